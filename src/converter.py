@@ -13,6 +13,8 @@ class PDFToTextConverter:
     """
     email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
     url_pattern = r"http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+    _EMAIL_RE = re.compile(email_pattern)
+    _URL_RE = re.compile(url_pattern)
 
     def __init__(self, filename: str) -> None:
         self.filename = self._validate_file(filename)
@@ -30,18 +32,15 @@ class PDFToTextConverter:
         self._validate_file(filename)
         with open(filename, mode="rb") as f:
             reader = pypdf.PdfReader(f)
-            writer = pypdf.PdfWriter(clone_from=reader)
-            writer.remove_annotations(subtypes=None)
-        return self._remove_noise(" ".join(page.extract_text()
-                                  for page in writer.pages))
+            pages_text = [page.extract_text() or "" for page in reader.pages]
+        return self._remove_noise(" ".join(pages_text))
 
     def _remove_noise(self, text):
-        index = text.lower().rfind("references") or text.lower().rfind(
-            "bibliography")
+        lower = text.lower()
+        index = max(lower.rfind("references"), lower.rfind("bibliography"))
         if (index != -1):
             text = text[:index]
-        text = re.sub(self.url_pattern, "", re.sub(self.email_pattern, "",
-                                                   text))
+        text = self._URL_RE.sub("", self._EMAIL_RE.sub("", text))
         return text.replace("-", "")
 
     def export(self, filename: str) -> None:
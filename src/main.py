@@ -1,8 +1,5 @@
 import argparse
-import nltk_summarizer
 import converter
-import transformers_summarizer
-import sumy_summarizer
 import streamlit as st
 import clipboard
 
@@ -13,7 +10,7 @@ def main():
         logo_url = 'penguuuuu.png'
         st.sidebar.image(logo_url)
         st.header("Summary Bot")
-        pdf = st.file_uploader("Upload pdf")
+        pdfs = st.file_uploader("Upload pdf", accept_multiple_files=True)
 
         method = st.selectbox(
             "Choose a method to summarize", ["sumy", "nltk", "pegasus"],
@@ -22,20 +19,31 @@ def main():
         )
         if st.button("Summarize"):
             with st.spinner("In progress..."):
+                summaries = []
                 if method == "nltk":
-                    #summarizer_text = converter.PDFToTextConverter(pdf.name)
-                    #output = summarizer_text.disp()
-                    summarizer_nltk = nltk_summarizer.PDFSummarizer(pdf.name)
-                    summarizer_nltk.summarize()
-                    output = summarizer_nltk.suma()
+                    import nltk_summarizer
+                    for pdf in pdfs:
+                        #summarizer_text = converter.PDFToTextConverter(pdf.name)
+                        #output = summarizer_text.disp()
+                        summarizer_nltk = nltk_summarizer.PDFSummarizer(pdf.name)
+                        summarizer_nltk.summarize()
+                        summaries.append(summarizer_nltk.suma())
                 elif method == "pegasus":
-                    summarizer_pegasus = transformers_summarizer.PDFSummarizer(pdf.name)
-                    summarizer_pegasus.summarize()
-                    output = summarizer_pegasus.suma()
+                    import transformers_summarizer
+                    for pdf in pdfs:
+                        summarizer_pegasus = transformers_summarizer.PDFSummarizer(pdf.name)
+                        summarizer_pegasus.summarize()
+                        summaries.append(summarizer_pegasus.suma())
                 elif method == "sumy":
-                    summarizer_sumy = sumy_summarizer.PDFSummarizer(pdf.name)
-                    summarizer_sumy.summarize()
-                    output = summarizer_sumy.suma()
+                    import sumy_summarizer
+                    summaries = sumy_summarizer.summarize_pdfs(
+                        [pdf.name for pdf in pdfs])
+                if len(summaries) == 1:
+                    output = summaries[0]
+                else:
+                    output = "\n\n".join(
+                        f"{pdf.name}: {summary}"
+                        for pdf, summary in zip(pdfs, summaries))
 
     with st.container():
         st.write("Your summarization is here!")
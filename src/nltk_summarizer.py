@@ -1,18 +1,82 @@
+import heapq
 import re
-from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor
-from itertools import islice
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
 
 import enchant
 import nltk
 import wordninja
-from nltk import FreqDist
 from nltk.corpus import stopwords
 from nltk.tokenize import sent_tokenize, word_tokenize
-from transformers import pipeline
+from transformers import AutoTokenizer, pipeline
 
 from converter import PDFToTextConverter
 
+_NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "stopwords": "corpora/stopwords",
+    "averaged_perceptron_tagger": "taggers/averaged_perceptron_tagger",
+    "maxent_ne_chunker": "chunkers/maxent_ne_chunker",
+    "words": "corpora/words",
+}
+
+for resource, path in _NLTK_RESOURCES.items():
+    try:
+        nltk.data.find(path)
+    except LookupError:
+        nltk.download(resource, quiet=True)
+
+_STOP_WORDS = frozenset(stopwords.words("english"))
+_ENG_DICT = enchant.Dict("en_US")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def _check_and_split(word: str) -> tuple:
+    if len(word) <= 5 or _ENG_DICT.check(word):
+        return (word, )
+    split_words = wordninja.split(word)
+    if all(_ENG_DICT.check(w) for w in split_words):
+        return tuple(split_words)
+    return (word, )
+
+
+_ONNX_UNSUPPORTED_KWARGS = {"device", "device_map", "dtype", "torch_dtype"}
+_pipeline_cache = {}
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline(model: str, onnx: bool = False, **pipeline_kwargs):
+    # Keyed on repr() rather than lru_cache so unhashable kwargs such as
+    # model_kwargs={...} still work. Only the last pipeline is kept; the lock
+    # stops concurrent Streamlit sessions from loading it twice.
+    key = (model, onnx, repr(sorted(pipeline_kwargs.items())))
+    with _pipeline_lock:
+        if key not in _pipeline_cache:
+            _pipeline_cache.clear()
+            _pipeline_cache[key] = _load_pipeline(model, onnx,
+                                                  **pipeline_kwargs)
+        return _pipeline_cache[key]
+
+
+def _load_pipeline(model: str, onnx: bool, **pipeline_kwargs):
+    if not onnx:
+        return pipeline(task="summarization", model=model, **pipeline_kwargs)
+    unsupported = _ONNX_UNSUPPORTED_KWARGS & pipeline_kwargs.keys()
+    if unsupported:
+        raise ValueError(
+            f"{', '.join(sorted(unsupported))} cannot be used with onnx=True, "
+            "the ONNX model always runs on CPUExecutionProvider.")
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    ort_model = ORTModelForSeq2SeqLM.from_pretrained(
+        model, export=True, provider="CPUExecutionProvider")
+    return pipeline(task="summarization",
+                    model=ort_model,
+                    tokenizer=AutoTokenizer.from_pretrained(model),
+                    **pipeline_kwargs)
+
 
 class PDFSummarizer(PDFToTextConverter):
     """
@@ -21,68 +85,57 @@ class PDFSummarizer(PDFToTextConverter):
     The class inherits from PDFToTextConverter, which is a class that converts PDF files to text. The summarized text can be exported to a file using the export() method.
 
     Attributes:
-        CHUNK_SIZE (int): The size of the text chunks to be processed concurrently. Default is 4096.
+        CHUNK_SIZE (int): The size of the text chunks to be tokenized. Default is 4096.
         MAX_LENGTH (int): The maximum length of the generated summary. Default is 100.
         MIN_LENGTH (int): The minimum length of the generated summary. Default is 30.
         NUM_SENTENCES (int): The number of sentences to include in the summary. Default is 50.
+        BATCH_SIZE (int): The number of chunks passed to the summarization pipeline per forward pass. Default is 8.
+
+    Args:
+        filename (str): The name of the PDF file to summarize.
+        model (str): The name or path of the summarization model. Defaults to sshleifer/distilbart-cnn-12-3, which keeps all 12 encoder layers but only 3 decoder layers; it generates noticeably faster than distilbart-cnn-12-6 for a small drop in ROUGE.
+        onnx (bool): Export the model to ONNX and run it with ONNX Runtime on CPU instead of PyTorch. Requires optimum[onnxruntime]. Device and dtype kwargs (device, device_map, dtype, torch_dtype) raise ValueError with it. Default is False.
+
+    Extra keyword arguments (e.g. device=0, torch_dtype=torch.float16) are forwarded to the transformers pipeline; with onnx=True only kwargs that do not pick a device or dtype are accepted.
     """
     CHUNK_SIZE = 4096
     MAX_LENGTH = 80  # modify
     MIN_LENGTH = 30
     NUM_SENTENCES = 20
-
-    def __init__(self, filename: str) -> None:
+    BATCH_SIZE = 8
+    caption_pattern = re.compile(r"Figure|Fig|Tab|Table")
+
+    def __init__(self,
+                 filename: str,
+                 model: str = "sshleifer/distilbart-cnn-12-3",
+                 onnx: bool = False,
+                 **pipeline_kwargs) -> None:
         super().__init__(filename)
-        self._download()
-        self.stop_words = set(stopwords.words("english"))
+        self.stop_words = _STOP_WORDS
         self.text = self._sanitize(self.text)
         self.chunks = PDFSummarizer.split_text(self.text, self.CHUNK_SIZE)
         self.summary = ""
-        self.summarizer = pipeline(task="summarization",
-                                   model="sshleifer/distilbart-cnn-12-6")
+        self.summarizer = _get_pipeline(model, onnx, **pipeline_kwargs)
 
     def _sanitize(self, text):
         return re.sub(r"\[\d+\]", "",
                       re.sub(r"http\S+", "", text, flags=re.MULTILINE))
 
-    def _download(self) -> None:
-        nltk.download("punkt")
-        nltk.download("stopwords")
-        nltk.download("averaged_perceptron_tagger")
-        nltk.download("maxent_ne_chunker")
-        nltk.download("words")
-
     @staticmethod
     def split_text(text: str, chunk_size: int) -> list:
         return [
             text[i:i + chunk_size] for i in range(0, len(text), chunk_size)
         ]
 
-    def process_concurrently(self, tokens: list, num_threads: int,
-                             operation) -> None:
-        with ThreadPoolExecutor(max_workers=num_threads) as executor:
-            futures = []
-            for i in range(num_threads):
-                offset = i * self.CHUNK_SIZE
-                chunk = list(islice(tokens, offset, offset + self.CHUNK_SIZE))
-                futures.append(executor.submit(operation, chunk))
-            return [
-                sentence for future in futures for sentence in future.result()
-            ]
-
     @staticmethod
     def tokenize_sentences(chunks: list) -> list:
         return [token for chunk in chunks for token in sent_tokenize(chunk)]
 
-    @staticmethod
-    def tokenize_words(chunks: list) -> list:
-        return [token for chunk in chunks for token in word_tokenize(chunk)]
-
     @staticmethod
     def filter_sentences(chunks: list) -> list:
         return [
-            token for token in chunks if len(token) > 1 and not any(
-                word in token for word in {"Figure", "Fig", "Tab", "Table"})
+            token for token in chunks if len(token) > 1
+            and not PDFSummarizer.caption_pattern.search(token)
         ]
 
     def filter_words(self, chunks: list) -> list:
@@ -92,21 +145,16 @@ class PDFSummarizer(PDFToTextConverter):
         ]
 
     def summarize(self, quiet=False) -> None:
-        self.sentences = self.process_concurrently(
-            self.chunks,
-            num_threads=4,
-            operation=PDFSummarizer.tokenize_sentences)
-        self.words = self.process_concurrently(
-            self.sentences,
-            num_threads=4,
-            operation=PDFSummarizer.tokenize_words)
-
-        self.filtered_sentences = self.process_concurrently(
-            self.sentences,
-            num_threads=4,
-            operation=PDFSummarizer.filter_sentences)
-        self.filtered_words = self.process_concurrently(
-            self.words, num_threads=4, operation=self.filter_words)
+        self.sentences = PDFSummarizer.tokenize_sentences(self.chunks)
+        self.filtered_sentences = PDFSummarizer.filter_sentences(
+            self.sentences)
+
+        sentence_tokens = [
+            word_tokenize(sentence.lower())
+            for sentence in self.filtered_sentences
+        ]
+        self.words = [word for tokens in sentence_tokens for word in tokens]
+        self.filtered_words = self.filter_words(self.words)
 
         if not quiet:
             print("===================================")
@@ -116,49 +164,45 @@ class PDFSummarizer(PDFToTextConverter):
             print(f"Filtered words length: {len(self.filtered_words)}")
             print("===================================")
 
-        frequency_table = FreqDist(self.filtered_words)
+        total = len(self.filtered_words)
+        frequency_table = {
+            word: count / total
+            for word, count in Counter(self.filtered_words).items()
+        }
 
         scores = OrderedDict()
-        for sentence in self.filtered_sentences:
-            sentence_words = word_tokenize(sentence.lower())
-            sentence_score = sum([
-                frequency_table.freq(word) for word in sentence_words
-                if word in self.filtered_words
-            ])
+        for sentence, sentence_words in zip(self.filtered_sentences,
+                                            sentence_tokens):
+            sentence_score = sum(frequency_table[word]
+                                 for word in sentence_words
+                                 if word in frequency_table)
             scores[sentence] = sentence_score
 
         self.CHUNK_SIZE = 1024
 
+        top_sentences = set(
+            heapq.nlargest(self.NUM_SENTENCES, scores, key=scores.get))
         raw_summary_chunks = PDFSummarizer.split_text(
             "".join([
-                sentence for sentence in scores.keys() if sentence in sorted(
-                    scores, key=scores.get, reverse=True)[:self.NUM_SENTENCES]
+                sentence for sentence in scores.keys()
+                if sentence in top_sentences
             ]), self.CHUNK_SIZE)
 
-        with ThreadPoolExecutor() as executor:
-            futures = list(
-                executor.map(self._summarize_chunk, raw_summary_chunks))
-            self.summary = "".join(futures)
-            self._correct_summary()
-
-    def _summarize_chunk(self, chunk) -> str:
-        return self.summarizer(chunk,
-                               max_length=self.MAX_LENGTH,
-                               min_length=self.MIN_LENGTH,
-                               do_sample=True)[0]["summary_text"]
+        outputs = self.summarizer(raw_summary_chunks,
+                                  max_length=self.MAX_LENGTH,
+                                  min_length=self.MIN_LENGTH,
+                                  do_sample=False,
+                                  batch_size=self.BATCH_SIZE,
+                                  truncation=True)
+        self.summary = "".join(output["summary_text"] for output in outputs)
+        self._correct_summary()
 
     def _correct_summary(self) -> None:
-        eng_dict = enchant.Dict("en_US")
         words = word_tokenize(self.summary)
         clean_summary = []
         for word in words:
-            split_words = wordninja.split(word)
-            if len(word) > 5 and not eng_dict.check(word) and all(
-                    eng_dict.check(w) for w in split_words):
-                clean_summary.extend(split_words)
-            else:
-                clean_summary.append(word)
-        self.summary = re.sub("\s+", " ", " ".join(clean_summary)).strip()
+            clean_summary.extend(_check_and_split(word))
+        self.summary = _WHITESPACE_RE.sub(" ", " ".join(clean_summary)).strip()
 
     def export(self, filename: str) -> None:
         with open(filename, mode="w", encoding="utf-8") as f:
@@ -1,3 +1,7 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from sumy.parsers.plaintext import PlaintextParser
 from sumy.nlp.tokenizers import Tokenizer
 from sumy.summarizers.lsa import LsaSummarizer as Summarizer
@@ -18,23 +22,54 @@ class PDFSummarizer(PDFToTextConverter):
     """
     LANGUAGE = "english"
     NUM_SENTENCES = 20
+    _summarizers = {}
 
     def __init__(self, filename) -> None:
         super().__init__(filename)
         self.summary = ""
 
+    @classmethod
+    def _get_summarizer(cls, language: str) -> Summarizer:
+        if language not in cls._summarizers:
+            summarizer = Summarizer(Stemmer(language))
+            summarizer.stop_words = frozenset(get_stop_words(language))
+            cls._summarizers[language] = summarizer
+        return cls._summarizers[language]
+
     def summarize(self) -> None:
-        stemmer = Stemmer(self.LANGUAGE)
-        summarizer = Summarizer(stemmer)
+        summarizer = self._get_summarizer(self.LANGUAGE)
         parser = PlaintextParser.from_string(self.text,
                                              Tokenizer(self.LANGUAGE))
-        summarizer.stop_words = get_stop_words(self.LANGUAGE)
-        for sentence in summarizer(parser.document, self.NUM_SENTENCES):
-            self.summary += sentence._text
+        self.summary += "".join(
+            sentence._text
+            for sentence in summarizer(parser.document, self.NUM_SENTENCES))
 
     def export(self, filename: str) -> None:
         with open(filename, mode="w", encoding="utf-8") as f:
             f.write(self.summary)
 
     def suma(self):
-        return self.summary
\ No newline at end of file
+        return self.summary
+
+
+def _summarize(filename: str) -> str:
+    summarizer = PDFSummarizer(filename)
+    summarizer.summarize()
+    return summarizer.suma()
+
+
+def summarize_pdfs(filenames: list, max_workers=None) -> list:
+    """
+    Summarize several PDF files, one worker process per document, and return the summaries in the same order as filenames.
+
+    Workers are spawned rather than forked, so they never inherit the Streamlit server's threads or an initialized CUDA context; they import only this module.
+    With a single file or a single CPU the files are summarized in-process, since the ~1.4 s it takes to spawn a worker and import sumy would only add to the run time.
+    """
+    if max_workers is None:
+        max_workers = min(len(filenames), os.cpu_count() or 1)
+    if max_workers <= 1:
+        return [_summarize(filename) for filename in filenames]
+    with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn")) as executor:
+        return list(executor.map(_summarize, filenames))
\ No newline at end of file
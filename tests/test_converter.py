@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("pypdf")
+
+from converter import PDFToTextConverter
+
+
+def _remove_noise(text):
+    # _remove_noise only uses class attributes, so no PDF is needed.
+    return PDFToTextConverter.__new__(PDFToTextConverter)._remove_noise(text)
+
+
+def test_remove_noise_only_bibliography():
+    assert _remove_noise("Body text. Bibliography [1] A.") == "Body text. "
+
+
+def test_remove_noise_references_at_start():
+    assert _remove_noise("References [1] A.") == ""
+
+
+def test_remove_noise_later_heading_wins():
+    assert (_remove_noise("Body. References [1] A. Bibliography [2] B.") ==
+            "Body. References [1] A. ")
+    assert (_remove_noise("Body. Bibliography [1] A. References [2] B.") ==
+            "Body. Bibliography [1] A. ")
+
+
+def test_remove_noise_no_heading():
+    assert _remove_noise("Body text only.") == "Body text only."
@@ -0,0 +1,79 @@
+import re
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("nltk")
+
+import transformers_summarizer
+from transformers_summarizer import PDFSummarizer
+
+
+class WordTokenizer:
+    """Counts one token per whitespace-separated word, plus one special token."""
+
+    def __call__(self, sentences, add_special_tokens=True):
+        return {"input_ids": [[0] * len(s.split()) for s in sentences]}
+
+    def num_special_tokens_to_add(self):
+        return 1
+
+
+@pytest.fixture(autouse=True)
+def split_on_periods(monkeypatch):
+    # The packing is under test, not punkt, so split on ". " instead.
+    monkeypatch.setattr(
+        transformers_summarizer, "sent_tokenize",
+        lambda text: [s for s in re.split(r"(?<=\.)\s+", text) if s])
+
+
+def _summarizer_with_text(text, chunk_size=11):
+    # Skip __init__ so no PDF or model weights are needed.
+    summarizer = PDFSummarizer.__new__(PDFSummarizer)
+    summarizer.text = text
+    summarizer.tokenizer = WordTokenizer()
+    summarizer.model = None
+    summarizer.num_beams = 1
+    summarizer.CHUNK_SIZE = chunk_size
+    return summarizer
+
+
+def _sentence(n):
+    return " ".join(["w"] * (n - 1) + ["w."])
+
+
+def test_split_text_empty():
+    summarizer = _summarizer_with_text("")
+    summarizer._split_text()
+    assert summarizer.chunks == []
+
+
+def test_summarize_empty():
+    summarizer = _summarizer_with_text("")
+    summarizer.summarize(quiet=True)
+    assert summarizer.suma() == ""
+
+
+def test_split_text_packs_up_to_budget():
+    # Budget is CHUNK_SIZE - 1 special token = 10 tokens.
+    summarizer = _summarizer_with_text(" ".join([_sentence(4), _sentence(6)]))
+    summarizer._split_text()
+    assert summarizer.chunks == [" ".join([_sentence(4), _sentence(6)])]
+
+
+def test_split_text_flushes_when_budget_exceeded():
+    summarizer = _summarizer_with_text(" ".join(
+        [_sentence(4), _sentence(6), _sentence(1)]))
+    summarizer._split_text()
+    assert summarizer.chunks == [
+        " ".join([_sentence(4), _sentence(6)]),
+        _sentence(1),
+    ]
+
+
+def test_split_text_over_budget_sentence_is_own_chunk():
+    summarizer = _summarizer_with_text(" ".join(
+        [_sentence(3), _sentence(12), _sentence(3)]))
+    summarizer._split_text()
+    assert summarizer.chunks == [_sentence(3), _sentence(12), _sentence(3)]